@@ -3,46 +3,56 @@ import pandas as pd
 
 db_path = "data/engagement.db"
 con = sqlite3.connect(db_path)
-
-# Load analytic_student_term for checks
-df = pd.read_sql_query("SELECT * FROM analytic_student_term", con)
+con.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+""")
+
+# Column list from the schema (no rows loaded)
+columns = [r[1] for r in con.execute("PRAGMA table_info(analytic_student_term)")]
+
+# Range checks, only for columns present in the table
+checks = {
+    "bad_grades": ("avg_grade", "avg_grade < 0 OR avg_grade > 100"),
+    "bad_attendance": ("attendance_ratio", "attendance_ratio < 0 OR attendance_ratio > 1"),
+    "bad_engagement": ("engagement_score", "engagement_score < 0 OR engagement_score > 1"),
+    "weird_terms": ("term", "term NOT LIKE '%20%'"),
+}
+checks = {k: cond for k, (col, cond) in checks.items() if col in columns}
+
+# All counts in a single aggregation query (one row back instead of the full table)
+select = ["COUNT(*) AS n_rows"]
+select += [f'SUM("{c}" IS NULL) AS "missing__{c}"' for c in columns]
+select += [f'SUM(CASE WHEN {cond} THEN 1 ELSE 0 END) AS "anomaly__{k}"' for k, cond in checks.items()]
+select.append("COUNT(*) - (SELECT COUNT(*) FROM (SELECT DISTINCT * FROM analytic_student_term)) AS duplicates")
+counts = pd.read_sql_query(
+    f"SELECT {', '.join(select)} FROM analytic_student_term", con
+).iloc[0].fillna(0)
 
 report = {}
 
 # Basic info
-report["rows"] = len(df)
-report["columns"] = list(df.columns)
+report["rows"] = int(counts["n_rows"])
+report["columns"] = columns
 
 # Missing values
-missing = df.isnull().sum()
-report["missing_values"] = missing[missing > 0].to_dict()
+missing = {c: int(counts[f"missing__{c}"]) for c in columns}
+report["missing_values"] = {k: v for k, v in missing.items() if v > 0}
 
 # Duplicates
-report["duplicates"] = int(df.duplicated().sum())
+report["duplicates"] = int(counts["duplicates"])
 
 # Anomaly checks
-anomalies = {}
-
-if "avg_grade" in df.columns:
-    bad_grades = df[(df["avg_grade"] < 0) | (df["avg_grade"] > 100)]
-    anomalies["bad_grades"] = len(bad_grades)
-
-if "attendance_ratio" in df.columns:
-    bad_attendance = df[(df["attendance_ratio"] < 0) | (df["attendance_ratio"] > 1)]
-    anomalies["bad_attendance"] = len(bad_attendance)
-
-if "engagement_score" in df.columns:
-    bad_engagement = df[(df["engagement_score"] < 0) | (df["engagement_score"] > 1)]
-    anomalies["bad_engagement"] = len(bad_engagement)
-
-if "term" in df.columns:
-    weird_terms = df[~df["term"].str.contains("20")]
-    anomalies["weird_terms"] = len(weird_terms)
+anomalies = {k: int(counts[f"anomaly__{k}"]) for k in checks}
 
 report["anomalies"] = anomalies
 
 # Save as CSV
-df.head(100).to_csv("data/sample_data_preview.csv", index=False)  # preview of 100 rows
+preview = pd.read_sql_query("SELECT * FROM analytic_student_term LIMIT 100", con)
+preview.to_csv("data/sample_data_preview.csv", index=False)  # preview of 100 rows
 
 # Save report to Markdown
 with open("data/data_quality_report.md", "w") as f:
@@ -1,13 +1,13 @@
 import sqlite3
+import sys
 
 # Connect to the engagement database
 con = sqlite3.connect("data/engagement.db")
 cur = con.cursor()
 
 # List all tables
-print("📋 Tables in DB:")
-for row in cur.execute("SELECT name FROM sqlite_master WHERE type='table';"):
-    print("-", row[0])
+tables = cur.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+sys.stdout.write("📋 Tables in DB:\n" + "".join(f"- {t[0]}\n" for t in tables))
 
 # Check student count
 cur.execute("SELECT COUNT(*) FROM students;")
@@ -15,9 +15,7 @@ print("\n👩‍🎓 Students table count:", cur.fetchone()[0])
 
 # Show sample rows from analytic_student_term
 print("\n🔎 Sample rows from analytic_student_term:")
-cur.execute("SELECT * FROM analytic_student_term LIMIT 5;")
-rows = cur.fetchall()
-for r in rows:
-    print(r)
+rows = cur.execute("SELECT * FROM analytic_student_term LIMIT 5;").fetchall()
+sys.stdout.write("".join(f"{r}\n" for r in rows))
 
 con.close()
\ No newline at end of file
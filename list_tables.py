@@ -1,12 +1,11 @@
 import sqlite3
+import sys
 
 db_path = "data/engagement.db"
 con = sqlite3.connect(db_path)
 
 tables = con.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
 
-print("Tables in database:")
-for t in tables:
-    print("-", t[0])
+sys.stdout.write("Tables in database:\n" + "".join(f"- {t[0]}\n" for t in tables))
 
 con.close()
\ No newline at end of file
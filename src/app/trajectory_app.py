@@ -6,29 +6,98 @@ Student Trajectory App — Interactive (clean build)
 - Student profile: KPIs, Timeline, Attendance, LMS, Assessments, Data & Notes
 - Deep link: ?sid=<student_id>
 """
-import os, sqlite3, subprocess
-from datetime import datetime
+import os, sys, sqlite3, subprocess, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import altair as alt
 
+try:
+    import duckdb
+except ImportError:  # optional: cohort aggregates fall back to sqlite3
+    duckdb = None
+
+# Shared analytic-table schema helpers live with the loader
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sql"))
+from load_to_sqlite import add_analytic_columns
+
 DB_PATH = os.path.join("data", "engagement.db")
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+"""
+# Live risk rule; binds (attendance ratio, activity decile, midterm) thresholds
+AT_RISK_LIVE_SQL = "(((attendance_rate < ?) OR (activity_decile <= ?)) AND (midterm < ?))"
 
 # ===================== Data helpers =====================
-@st.cache_data(show_spinner=False)
-def load_sql(query: str, params: tuple = ()):
-    con = sqlite3.connect(DB_PATH)
+def _open_con():
+    con = sqlite3.connect(DB_PATH, check_same_thread=False)
+    con.executescript(SQLITE_PRAGMAS)
+    return con
+
+@st.cache_resource(show_spinner=False)
+def get_con():
+    """One shared connection per Streamlit process (WAL + read-friendly PRAGMAs)."""
+    return _open_con()
+
+@st.cache_resource(show_spinner=False)
+def get_loader_pool():
+    """Thread pool for per-student loads; each worker owns a read connection.
+
+    A single sqlite3 connection serialises its queries, so parallel reads
+    need one connection per worker (WAL lets them read concurrently).
+    """
+    local = threading.local()
+    def _init_worker():
+        local.con = _open_con()
+    return ThreadPoolExecutor(max_workers=5, initializer=_init_worker), local
+
+@st.cache_resource(show_spinner=False)
+def get_write_lock():
+    """Serialises writes on the shared connection across sessions."""
+    return threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def get_duck():
+    """DuckDB with the SQLite file attached read-only as `s`.
+
+    Returns None when duckdb or its sqlite extension is unavailable
+    (e.g. offline install), so callers can fall back to sqlite3.
+    """
+    if duckdb is None:
+        return None
     try:
-        return pd.read_sql_query(query, con, params=params)
-    finally:
-        con.close()
+        d = duckdb.connect()
+        d.execute(f"ATTACH '{DB_PATH}' AS s (TYPE SQLITE, READ_ONLY);")
+        return d
+    except Exception:
+        return None
+
+@st.cache_data(show_spinner=False)
+def load_sql(query: str, params: tuple = (), arrow: bool = False):
+    # arrow=True: pyarrow-backed columns for large result sets
+    kw = {"dtype_backend": "pyarrow"} if arrow else {}
+    con = getattr(get_loader_pool()[1], "con", None) or get_con()
+    return pd.read_sql_query(query, con, params=params, **kw)
+
+def _fts_prefix_query(q: str) -> str:
+    """'ana ben' -> '"ana"* "ben"*' (quoted tokens, prefix match, AND-ed)."""
+    return " ".join('"' + t.replace('"', '""') + '"*' for t in q.split())
 
 @st.cache_data(show_spinner=False)
 def list_students(q=None, program=None, intake=None):
     where, params = [], []
-    if q:
-        where.append("(full_name LIKE ? OR CAST(student_id AS TEXT)=?)")
-        params.extend([f"%{q}%", q])
+    q = (q or "").strip()
+    if q.isascii() and q.isdigit():
+        where.append("student_id = ?"); params.append(int(q))
+    elif q.split():
+        where.append("student_id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)")
+        params.append(_fts_prefix_query(q))
     if program and program != "All":
         where.append("program = ?"); params.append(program)
     if intake and intake != "All":
@@ -40,21 +109,138 @@ def list_students(q=None, program=None, intake=None):
         tuple(params)
     )
 
+def _cohort_where(program=None, intake=None, terms=()):
+    where, params = [], []
+    if program and program != "All":
+        where.append("program = ?"); params.append(program)
+    if intake and intake != "All":
+        where.append("intake = ?"); params.append(intake)
+    if terms:
+        where.append(f"term IN ({', '.join('?' * len(terms))})"); params.extend(terms)
+    clause = ("WHERE " + " AND ".join(where)) if where else ""
+    return clause, params
+
 @st.cache_data(show_spinner=False)
-def student_profile(student_id: int):
-    s = load_sql("SELECT * FROM students WHERE student_id = ?;", (student_id,))
-    ast = load_sql("SELECT * FROM analytic_student_term WHERE student_id = ? ORDER BY term;", (student_id,))
-    att = load_sql("SELECT week, term, sessions, attended FROM attendance WHERE student_id = ? ORDER BY term, week;", (student_id,))
-    lms = load_sql("SELECT activity_date, clicks FROM lms_activity WHERE student_id = ? ORDER BY activity_date;", (student_id,))
-    ev  = load_sql("SELECT event_type, event_date, term, details FROM student_events WHERE student_id = ? ORDER BY event_date;", (student_id,))
+def load_cohort(program=None, intake=None, terms: tuple = (),
+                th_att: float = 0.8, th_act: int = 3, th_mid: float = 50):
+    clause, params = _cohort_where(program, intake, terms)
+    df = load_sql(
+        f"SELECT *, {AT_RISK_LIVE_SQL} AS at_risk_live "
+        f"FROM analytic_student_term {clause} ORDER BY student_id, term;",
+        tuple([th_att, th_act, th_mid] + params), arrow=True
+    )
+    df["at_risk_live"] = df["at_risk_live"].astype(bool)  # SQLite returns 0/1
+    return df
+
+@st.cache_data(show_spinner=False)
+def cohort_metrics(program=None, intake=None, terms: tuple = (),
+                   th_att: float = 0.8, th_act: int = 3, th_mid: float = 50):
+    clause, params = _cohort_where(program, intake, terms)
+    sql = (
+        f"SELECT COUNT(DISTINCT student_id) AS students, "
+        f"AVG(attendance_rate) AS attendance_rate, "
+        f"AVG(activity_decile) AS activity_decile, "
+        f"AVG(midterm) AS midterm, "
+        f"AVG(CASE WHEN {AT_RISK_LIVE_SQL} THEN 1.0 ELSE 0.0 END) AS at_risk_live "
+        f"FROM {{table}} {clause};"
+    )
+    args = [th_att, th_act, th_mid] + params
+    duck = get_duck()
+    if duck is not None:
+        # Vectorized scan of the SQLite file; cursor() = per-thread handle
+        cur = duck.cursor()
+        row = cur.execute(sql.format(table="s.analytic_student_term"), args).fetchone()
+        return pd.Series(row, index=[d[0] for d in cur.description])
+    return load_sql(sql.format(table="analytic_student_term"), tuple(args)).iloc[0]
+
+# Sidebar lookups: tiny lists shared by all sessions (no pickle round trip)
+@st.cache_resource(show_spinner=False, ttl=3600)
+def get_programs() -> list[str]:
+    return [r[0] for r in get_con().execute("SELECT DISTINCT program FROM students ORDER BY program;")]
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def get_intakes() -> list[str]:
+    return [r[0] for r in get_con().execute("SELECT DISTINCT intake FROM students ORDER BY intake;")]
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def get_terms() -> list[str]:
+    return [r[0] for r in get_con().execute("SELECT DISTINCT term FROM analytic_student_term ORDER BY term;")]
+
+# Per-student loaders: one cached query each, explicit column projections.
+# cache_resource hands back the shared frame (no hash/pickle per hit), so
+# callers must not mutate it in place — filter or .copy() first.
+@st.cache_resource(show_spinner=False, ttl=1800, max_entries=256)
+def get_student_row(student_id: int):
+    s = load_sql(
+        "SELECT student_id, full_name, program, intake, enrol_date FROM students WHERE student_id = ?;",
+        (student_id,)
+    )
+    return s.iloc[0] if not s.empty else None
+
+@st.cache_resource(show_spinner=False, ttl=1800, max_entries=256)
+def get_ast(student_id: int, th_att: float = 0.8, th_act: int = 3, th_mid: float = 50):
+    # Full joined row: this frame also backs the student-term CSV download
+    ast = load_sql(
+        f"SELECT student_id, full_name, program, intake, age, gender, enrol_date, "
+        f"term, total_sessions, attended, clicks, midterm, final, late_submissions, "
+        f"attendance_rate, activity_decile, on_time_rate, at_risk, at_risk_std, year, "
+        f"{AT_RISK_LIVE_SQL} AS at_risk_live "
+        f"FROM analytic_student_term WHERE student_id = ? ORDER BY term;",
+        (th_att, th_act, th_mid, student_id)
+    )
+    ast["at_risk_live"] = ast["at_risk_live"].astype(bool)  # SQLite returns 0/1
+    return ast
+
+@st.cache_resource(show_spinner=False, ttl=1800, max_entries=256)
+def get_att(student_id: int):
+    return load_sql("SELECT week, term, sessions, attended FROM attendance WHERE student_id = ? ORDER BY term, week;", (student_id,))
+
+@st.cache_resource(show_spinner=False, ttl=1800, max_entries=256)
+def get_lms(student_id: int, d0: datetime, d1: datetime):
+    """Daily clicks in [d0, d1] plus a 7-day rolling sum computed by SQLite."""
+    lms = load_sql(
+        "SELECT activity_date, clicks, "
+        "SUM(clicks) OVER (ORDER BY activity_date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) AS rolling_7d "
+        "FROM lms_activity WHERE student_id = ? AND activity_date >= ? AND activity_date < ? "
+        "ORDER BY activity_date;",
+        (student_id, d0.date().isoformat(), (d1.date() + timedelta(days=1)).isoformat())
+    )
     if not lms.empty: lms["activity_date"] = pd.to_datetime(lms["activity_date"])
-    if not ev.empty:  ev["event_date"]   = pd.to_datetime(ev["event_date"])
-    return (s.iloc[0] if not s.empty else None), ast, att, lms, ev
+    return lms
+
+@st.cache_resource(show_spinner=False, ttl=1800, max_entries=256)
+def get_events(student_id: int):
+    ev = load_sql("SELECT event_type, event_date, term, details FROM student_events WHERE student_id = ? ORDER BY event_date;", (student_id,))
+    if not ev.empty: ev["event_date"] = pd.to_datetime(ev["event_date"])
+    return ev
+
+def prefetch_student(student_id: int, th_att: float, th_act: int, th_mid: float,
+                     d0: datetime, d1: datetime):
+    """Warm the five per-student caches with the queries running in parallel."""
+    pool, _ = get_loader_pool()
+    ctx = get_script_run_ctx()
+    def run(fn, *args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    futures = [
+        pool.submit(run, get_student_row, student_id),
+        pool.submit(run, get_ast, student_id, th_att, th_act, th_mid),
+        pool.submit(run, get_att, student_id),
+        pool.submit(run, get_lms, student_id, d0, d1),
+        pool.submit(run, get_events, student_id),
+    ]
+    for f in futures:
+        f.result()
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV payload for st.download_button, encoded once per distinct frame."""
+    return df.to_csv(index=False).encode("utf-8")
 
 # ----------------- Notes helpers -----------------
-def init_notes_table():
-    con = sqlite3.connect(DB_PATH)
-    try:
+def init_db():
+    con = get_con()
+    with get_write_lock(), con:
         con.execute("""
             CREATE TABLE IF NOT EXISTS advisor_notes (
                 student_id INTEGER,
@@ -62,25 +248,54 @@ def init_notes_table():
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             );
         """)
-        con.commit()
-    finally:
-        con.close()
+        con.execute("CREATE INDEX IF NOT EXISTS idx_ast_pit ON analytic_student_term(program, intake, term);")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_lms_sid_date ON lms_activity(student_id, activity_date);")
+        # Name search index (the loader builds it; this covers older DB files)
+        has_fts = con.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='students_fts';"
+        ).fetchone()
+        if not has_fts:
+            con.execute(
+                "CREATE VIRTUAL TABLE students_fts USING fts5("
+                "full_name, content='students', content_rowid='student_id');"
+            )
+            con.execute("INSERT INTO students_fts(students_fts) VALUES('rebuild');")
+        # Derived columns the loader adds (also covers older DB files)
+        add_analytic_columns(con)
+
+def add_notes(student_id:int, notes:list[str]):
+    """Insert several notes in one transaction (one commit for the batch)."""
+    con = get_con()
+    with get_write_lock(), con:
+        con.executemany(
+            "INSERT INTO advisor_notes (student_id, note) VALUES (?, ?);",
+            [(student_id, n) for n in notes]
+        )
 
 def add_note(student_id:int, note:str):
-    con = sqlite3.connect(DB_PATH)
-    try:
-        con.execute("INSERT INTO advisor_notes (student_id, note) VALUES (?, ?);", (student_id, note))
-        con.commit()
-    finally:
-        con.close()
+    add_notes(student_id, [note])
 
 def get_notes(student_id:int):
-    return load_sql(
+    # Not cached: must reflect a note saved a moment ago
+    return pd.read_sql_query(
         "SELECT note, created_at FROM advisor_notes WHERE student_id = ? ORDER BY created_at DESC;",
-        (student_id,)
+        get_con(), params=(student_id,)
     )
 
 # ===================== App =====================
+@st.fragment
+def notes_pane(student_id:int):
+    """Advisor notes; reruns on its own so saving a note skips the full page."""
+    st.subheader("Advisor Notes")
+    new_note = st.text_area("Add note", placeholder="e.g., Met on 2025‑02‑10; agreed to weekly study plan.")
+    colA, colB = st.columns([1,3])
+    with colA:
+        if st.button("Save note", use_container_width=True, disabled=(not new_note.strip())):
+            add_note(student_id, new_note.strip())
+            st.success("Note saved.")
+    notes = get_notes(student_id)
+    st.dataframe(notes, use_container_width=True)
+
 def main():
     st.set_page_config(page_title="Student Trajectory", page_icon="🎓", layout="wide")
     st.title("🎓 Student Trajectory Explorer")
@@ -91,7 +306,7 @@ def main():
         os.makedirs("data", exist_ok=True)
         subprocess.run(["python", "src/sql/load_to_sqlite.py"], check=True)
 
-    init_notes_table()
+    init_db()
 
     # Deep link: read ?sid= once
     qp = st.query_params
@@ -104,16 +319,14 @@ def main():
     # ---------- Sidebar ----------
     st.sidebar.header("Filters")
 
-    df_programs = load_sql("SELECT DISTINCT program FROM students ORDER BY program;")
-    programs = ["All"] + df_programs["program"].tolist()
+    programs = ["All"] + get_programs()
     program = st.sidebar.selectbox("Program", programs, index=0)
 
-    df_intakes = load_sql("SELECT DISTINCT intake FROM students ORDER BY intake;")
-    intakes = ["All"] + df_intakes["intake"].tolist()
+    intakes = ["All"] + get_intakes()
     intake = st.sidebar.selectbox("Intake", intakes, index=0)
 
     # Terms with default + fallback
-    terms_all = load_sql("SELECT DISTINCT term FROM analytic_student_term ORDER BY term;")["term"].tolist()
+    terms_all = get_terms()
     terms_sel = st.sidebar.multiselect("Show terms", terms_all, default=terms_all)
     if not terms_sel:
         terms_sel = terms_all
@@ -144,40 +357,28 @@ def main():
 
     # ---------- Cohort snapshot ----------
     with st.expander("Cohort snapshot (current filters)"):
-        cohort = load_sql("SELECT * FROM analytic_student_term;")
-
-        # live risk recompute
-        cohort["at_risk_live"] = (
-            ((cohort["attendance_rate"] < (th_att / 100)) | (cohort["activity_decile"] <= th_act))
-            & (cohort["midterm"] < th_mid)
-        )
-
-        # apply filters
-        if program != "All":
-            cohort = cohort[cohort["program"] == program]
-        if intake != "All":
-            cohort = cohort[cohort["intake"] == intake]
-        cohort = cohort[cohort["term"].isin(terms_sel)]
+        cohort = load_cohort(program, intake, tuple(terms_sel), th_att / 100, th_act, th_mid)
 
         if cohort.empty:
             st.info("No data with current filters. Try selecting more terms in the sidebar.")
         else:
+            m = cohort_metrics(program, intake, tuple(terms_sel), th_att / 100, th_act, th_mid)
+
             k1, k2, k3, k4, k5 = st.columns(5)
-            with k1: st.metric("Students", f"{cohort['student_id'].nunique():,}")
-            with k2: st.metric("Avg Attendance", f"{cohort['attendance_rate'].mean():.1%}")
-            with k3: st.metric("Avg Activity Decile", f"{cohort['activity_decile'].mean():.1f}")
-            with k4: st.metric("Avg Midterm", f"{cohort['midterm'].mean():.1f}")
-            with k5: st.metric("At-Risk % (live)", f"{cohort['at_risk_live'].mean():.1%}")
+            with k1: st.metric("Students", f"{int(m['students']):,}")
+            with k2: st.metric("Avg Attendance", f"{m['attendance_rate']:.1%}")
+            with k3: st.metric("Avg Activity Decile", f"{m['activity_decile']:.1f}")
+            with k4: st.metric("Avg Midterm", f"{m['midterm']:.1f}")
+            with k5: st.metric("At-Risk % (live)", f"{m['at_risk_live']:.1%}")
 
             st.dataframe(
                 cohort[["student_id","term","program","intake","attendance_rate",
-                        "activity_decile","midterm","final","at_risk_live"]]
-                .sort_values(["student_id","term"]),
+                        "activity_decile","midterm","final","at_risk_live"]],
                 use_container_width=True
             )
             st.download_button(
                 "Download cohort CSV",
-                cohort.to_csv(index=False).encode("utf-8"),
+                to_csv_bytes(cohort),
                 file_name="cohort_snapshot.csv", mime="text/csv"
             )
 
@@ -192,12 +393,15 @@ def main():
         st.stop()
 
     # ---------- Student profile ----------
-    student, ast, att, lms, ev = student_profile(sid)
+    prefetch_student(sid, th_att / 100, th_act, th_mid, date_range[0], date_range[1])
+    student = get_student_row(sid)
     if student is None:
         st.warning("Student not found."); st.stop()
 
     # Filter by selected terms
+    ast = get_ast(sid, th_att / 100, th_act, th_mid)
     ast = ast[ast["term"].isin(terms_sel)]
+    att = get_att(sid)
     att = att[att["term"].isin(terms_sel)]
 
     if ast.empty or att.empty:
@@ -207,12 +411,6 @@ def main():
     st.subheader(f"{student['full_name']}  ·  ID {int(student['student_id'])}")
     st.caption(f"{student['program']} · Intake {student['intake']} · Enrolled {student['enrol_date']}")
 
-    # Live risk flag on the student-term rows
-    ast["at_risk_live"] = (
-        ((ast["attendance_rate"] < (th_att/100)) | (ast["activity_decile"] <= th_act))
-        & (ast["midterm"] < th_mid)
-    )
-
     # KPI cards (latest term)
     latest = ast.sort_values("term").tail(1)
     c1, c2, c3, c4, c5 = st.columns(5)
@@ -229,6 +427,7 @@ def main():
 
     with tab_tl:
         st.caption("Lifecycle events for this student (use sidebar date window).")
+        ev = get_events(sid)
         if not ev.empty:
             ev_f = ev[(ev["event_date"] >= date_range[0]) & (ev["event_date"] <= date_range[1])]
             timeline = alt.Chart(ev_f).mark_circle(size=120).encode(
@@ -243,30 +442,28 @@ def main():
 
     with tab_att:
         st.caption("Weekly attendance by term; hover for details.")
-        att_plot = att.copy()
-        att_plot["pct"] = att_plot["attended"] / att_plot["sessions"]
-        chart_att = alt.Chart(att_plot).mark_line(point=True).encode(
+        chart_att = alt.Chart(att).transform_calculate(
+            pct='datum.attended / datum.sessions'
+        ).mark_line(point=True).encode(
             x=alt.X('week:O', title='Teaching Week'),
             y=alt.Y('pct:Q', title='Attendance %', scale=alt.Scale(domain=[0,1])),
             color='term:N',
-            tooltip=['term','week','attended','sessions','pct']
+            tooltip=['term:N','week:O','attended:Q','sessions:Q','pct:Q']
         ).properties(height=280)
         st.altair_chart(chart_att, use_container_width=True)
         st.download_button(
             "Download attendance (this student)",
-            att_plot.to_csv(index=False).encode("utf-8"),
+            to_csv_bytes(att.assign(pct=att["attended"] / att["sessions"])),
             file_name=f"student_{int(student['student_id'])}_attendance.csv", mime="text/csv"
         )
 
     with tab_lms:
         st.caption("Daily clicks & 7‑day rolling (filtered by date window).")
-        if not lms.empty:
-            l = lms.copy().sort_values("activity_date")
-            l = l[l["activity_date"].between(date_range[0], date_range[1])]
-            l["rolling_7d"] = l["clicks"].rolling(7, min_periods=1).sum()
-            long = l.melt(id_vars=["activity_date"], value_vars=["clicks","rolling_7d"],
-                          var_name="metric", value_name="value")
-            chart_lms = alt.Chart(long).mark_line().encode(
+        l = get_lms(sid, date_range[0], date_range[1])
+        if not l.empty:
+            chart_lms = alt.Chart(l).transform_fold(
+                ["clicks","rolling_7d"], as_=["metric","value"]
+            ).mark_line().encode(
                 x=alt.X('activity_date:T', title='Date'),
                 y=alt.Y('value:Q', title='Clicks'),
                 color='metric:N',
@@ -275,7 +472,7 @@ def main():
             st.altair_chart(chart_lms, use_container_width=True)
             st.download_button(
                 "Download LMS (this student)",
-                l.to_csv(index=False).encode("utf-8"),
+                to_csv_bytes(l),
                 file_name=f"student_{int(student['student_id'])}_lms.csv", mime="text/csv"
             )
         else:
@@ -283,13 +480,13 @@ def main():
 
     with tab_asmt:
         st.caption("Scores per term with live at‑risk flag.")
-        long_scores = ast.melt(id_vars=["term"], value_vars=["midterm","final"],
-                               var_name="assessment", value_name="score")
-        bar = alt.Chart(long_scores).mark_bar().encode(
+        bar = alt.Chart(ast[["term","midterm","final"]]).transform_fold(
+            ["midterm","final"], as_=["assessment","score"]
+        ).mark_bar().encode(
             x=alt.X('term:N', title="Term"),
             y=alt.Y('score:Q', title="Score"),
             color='assessment:N',
-            tooltip=['term','assessment','score']
+            tooltip=['term:N','assessment:N','score:Q']
         ).properties(height=280)
         st.altair_chart(bar, use_container_width=True)
         st.dataframe(
@@ -301,19 +498,11 @@ def main():
         st.caption("All joined data for this student (filtered).")
         st.download_button(
             "Download student-term CSV",
-            ast.sort_values("term").to_csv(index=False).encode("utf-8"),
+            to_csv_bytes(ast.sort_values("term")),
             file_name=f"student_{int(student['student_id'])}_terms.csv", mime="text/csv"
         )
         st.markdown("---")
-        st.subheader("Advisor Notes")
-        new_note = st.text_area("Add note", placeholder="e.g., Met on 2025‑02‑10; agreed to weekly study plan.")
-        colA, colB = st.columns([1,3])
-        with colA:
-            if st.button("Save note", use_container_width=True, disabled=(not new_note.strip())):
-                add_note(int(student["student_id"]), new_note.strip())
-                st.success("Note saved."); st.experimental_rerun()
-        notes = get_notes(int(student["student_id"]))
-        st.dataframe(notes, use_container_width=True)
+        notes_pane(int(student["student_id"]))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,7 @@
+import csv
 import sqlite3
-import pandas as pd
+
+from load_to_sqlite import add_analytic_columns
 
 # Connect to your engagement.db
 import os
@@ -8,9 +10,27 @@ base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 db_path = os.path.join(base_dir, "data", "engagement.db")
 
 con = sqlite3.connect(db_path)
+con.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+""")
+with con:
+    add_analytic_columns(con)  # older DB files lack the derived columns
+
+
+def export_csv(query, out_path):
+    """Stream a query result to CSV row by row (header from cursor.description)."""
+    cur = con.execute(query)
+    with open(out_path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow([d[0] for d in cur.description])
+        writer.writerows(cur)
 
 # 1. Cohort-level summary (average metrics per program & intake)
-cohort = pd.read_sql("""
+export_csv("""
 SELECT program, intake,
        AVG(attendance_rate) AS avg_attendance,
        AVG(activity_decile) AS avg_activity,
@@ -18,33 +38,27 @@ SELECT program, intake,
        AVG(final) AS avg_final
 FROM analytic_student_term
 GROUP BY program, intake
-""", con)
-cohort.to_csv("../../data/cohort_summary.csv", index=False)
+""", "../../data/cohort_summary.csv")
 print("✅ cohort_summary.csv exported.")
 
 # 2. At-risk students list
-at_risk = pd.read_sql("""
+export_csv("""
 SELECT student_id, program, intake,
        attendance_rate, activity_decile, midterm, final,
-       CASE
-           WHEN attendance_rate < 0.8 OR activity_decile < 3 OR midterm < 50
-           THEN 1 ELSE 0
-       END AS at_risk
+       at_risk_std AS at_risk
 FROM analytic_student_term
-""", con)
-at_risk.to_csv("../../data/at_risk_students.csv", index=False)
+""", "../../data/at_risk_students.csv")
 print("✅ at_risk_students.csv exported.")
 
 # 3. Engagement trends by year
-trend = pd.read_sql("""
-SELECT SUBSTR(term, 1, 4) AS year, program,
+export_csv("""
+SELECT year, program,
        AVG(attendance_rate) AS avg_attendance,
        AVG(activity_decile) AS avg_activity
 FROM analytic_student_term
 GROUP BY year, program
-ORDER BY year
-""", con)
-trend.to_csv("../../data/engagement_trends.csv", index=False)
+ORDER BY year, program
+""", "../../data/engagement_trends.csv")
 print("✅ engagement_trends.csv exported.")
 
 con.close()
@@ -12,7 +12,11 @@ Full synthetic data loader (multi-year, per-program durations)
 """
 
 import os, sys, sqlite3, argparse
-from datetime import date, datetime, timedelta
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+from datetime import date, datetime
 import numpy as np
 import pandas as pd
 
@@ -22,6 +26,32 @@ PROGRAM_DURATION = {
     "Pharmacy": 5,
 }
 
+# Base tables: {column: SQL type} schema and single-column indexes
+BASE_TABLES = {
+    "attendance": ({"student_id": "INTEGER", "term": "TEXT", "week": "INTEGER",
+                    "sessions": "INTEGER", "attended": "INTEGER"},
+                   ["student_id","term","week"]),
+    "lms_activity": ({"student_id": "INTEGER", "activity_date": "TEXT", "clicks": "INTEGER"},
+                     ["student_id","activity_date"]),
+    "assessments": ({"student_id": "INTEGER", "term": "TEXT", "midterm": "REAL",
+                     "final": "REAL", "late_submissions": "INTEGER"},
+                    ["student_id","term"]),
+    "student_events": ({"student_id": "INTEGER", "event_type": "TEXT", "event_date": "TIMESTAMP",
+                        "details": "TEXT", "term": "TEXT"},
+                       ["student_id","event_date","event_type"]),
+}
+
+# Derived analytic_student_term columns as VIRTUAL generated columns: unlike
+# STORED ones SQLite can ALTER TABLE ADD them, so the app migrates older DB
+# files in place with the same definitions the loader uses
+ANALYTIC_DERIVED_COLUMNS = {
+    # Fixed 0.8/3/50 at-risk rule used by export_to_csv.py
+    "at_risk_std": "INTEGER GENERATED ALWAYS AS "
+                   "(attendance_rate < 0.8 OR activity_decile < 3 OR midterm < 50) VIRTUAL",
+    # Academic year of the term, for year/program trends
+    "year": "INTEGER GENERATED ALWAYS AS (CAST(substr(term, 1, 4) AS INTEGER)) VIRTUAL",
+}
+
 # ---------------- CLI ----------------
 def parse_args():
     p = argparse.ArgumentParser()
@@ -30,9 +60,12 @@ def parse_args():
     p.add_argument("--year_end", type=int, default=2025, help="Last academic year bound (Spring ends no later than this if possible)")
     p.add_argument("--seed", type=int, default=42, help="Random seed")
     p.add_argument("--db", type=str, default=os.path.join("data", "engagement.db"), help="SQLite DB path")
+    p.add_argument("--workers", type=int, default=4, help="Processes for the table builders (1 = in-process)")
+    p.add_argument("--chunk_size", type=int, default=1000, help="Students generated and written per chunk")
     return p.parse_args()
 
 # ------------- Helpers --------------
+@lru_cache(maxsize=None)
 def term_dates(term: str) -> tuple[pd.Timestamp, pd.Timestamp]:
     """Return (start_date, end_date) for 'YYYY-Fall' or 'YYYY-Spring'."""
     y, sem = term.split("-")
@@ -42,65 +75,88 @@ def term_dates(term: str) -> tuple[pd.Timestamp, pd.Timestamp]:
     else:  # Spring
         return pd.Timestamp(y, 1, 1), pd.Timestamp(y, 6, 30)
 
-def all_terms_for_program(intake: str, program: str, duration_map: dict) -> list[str]:
+def term_bounds(terms) -> pd.DataFrame:
+    """Return a (term, lo, hi) frame for the distinct `terms`, in date order."""
+    rows = [(t, *term_dates(t)) for t in pd.unique(np.asarray(terms))]
+    return pd.DataFrame(rows, columns=["term","lo","hi"]).sort_values("lo", ignore_index=True)
+
+def student_terms(students: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Given intake like '2018-Sep' or '2019-Jan', return all academic terms
-    (Fall/Spring pairs) for the programme duration.
+    Flat (student, term) grid covering every student's full programme.
+
+    Returns (row, term, n_terms): `row` is the position in `students` of each
+    grid row, `term` its 'YYYY-Fall'/'YYYY-Spring' label (Fall/Spring pairs
+    from intake onward) and `n_terms` the per-student row counts. Built with
+    np.repeat from 2*PROGRAM_DURATION indexed by the programme codes.
     """
-    start_year = int(intake.split("-")[0])
-    # Jan intake's first academic year Spring happens in 'start_year'
-    if intake.endswith("Jan"):
-        first_fall_year = start_year - 1
-    else:  # Sep intake
-        first_fall_year = start_year
-
-    n_years = int(duration_map.get(program, 4))
-    terms = []
-    for k in range(n_years):
-        fall_y = first_fall_year + k
-        spring_y = fall_y + 1
-        terms.append(f"{fall_y}-Fall")
-        terms.append(f"{spring_y}-Spring")
-    return terms
+    program = pd.Categorical(students["program"], categories=list(PROGRAM_DURATION))
+    dur_arr = np.array(list(PROGRAM_DURATION.values()), dtype=np.int64)
+    n_terms = 2 * dur_arr[program.codes]
+
+    row = np.repeat(np.arange(len(students)), n_terms)
+    k = np.arange(n_terms.sum()) - np.repeat(np.cumsum(n_terms) - n_terms, n_terms)
+    intake = students["intake"].str
+    # Jan intake's first academic year Spring happens in the intake year
+    first_fall = intake[:4].astype(int).to_numpy() - intake.endswith("Jan").to_numpy()
+    year = first_fall[row] + (k + 1) // 2  # Spring of year k falls in fall_y + 1
+    term = np.char.add(year.astype("U4"), np.where(k % 2 == 0, "-Fall", "-Spring"))
+    return row, term, n_terms
 
 def unique_names(n: int, rng: np.random.Generator) -> list[str]:
     """Large, readable synthetic name space to minimize duplicates."""
     first_syl = ["A", "Be", "Ca", "Da", "El", "Fa", "Gi", "Ha", "I", "Ja", "Ka", "La", "Ma", "Na", "O", "Pa", "Qi", "Ra", "Sa", "Ta", "Uma", "Va", "Wa", "Xa", "Ya", "Za"]
     last_syl1 = ["Al", "Ben", "Car", "Dia", "Fern", "Gon", "Ham", "Ivan", "Jun", "Kim", "Lee", "Mor", "Nov", "Omar", "Park", "Quan", "Ross", "Sing", "Tan", "Umar", "Val", "Wang", "Xu", "Yam", "Zar"]
     last_syl2 = ["son", "s", "ez", "ov", "ski", "sen", "Li", "chi", "yan", "man", "ford", "elli", "dell", "berg", "wala", "ova", "ian", "aro", "etti", "ato", "ino"]
-    middle = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-
-    combos = []
-    for a in first_syl:
-        for b in last_syl1:
-            for c in last_syl2:
-                combos.append((a, b + c))
-    rng.shuffle(combos)
-
-    out, used = [], set()
-    i = 0
-    while len(out) < n:
-        fi, la = combos[i % len(combos)]
-        # readable first name like 'Ana', 'Bena', 'Cana', …
-        first = f"{fi}na"
-        mid = rng.choice(middle)
-        candidate = f"{first} {la} {mid}."
-        if candidate not in used:
-            out.append(candidate)
-            used.add(candidate)
-        i += 1
-        if i > len(combos) * 2:  # last resort
-            candidate = f"{first} {la} {mid}.{rng.integers(1,9999)}"
-            if candidate not in used:
-                out.append(candidate)
-                used.add(candidate)
-    return out[:n]
+    middle = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+    # readable first name like 'Ana', 'Bena', 'Cana', … + composed surname
+    combos = np.array([f"{a}na {b}{c}" for a, b, c in product(first_syl, last_syl1, last_syl2)])
+    # Walk a random permutation of the combos; each combo is used once per cycle
+    idx = np.arange(n)
+    base = combos[rng.permutation(len(combos))[idx % len(combos)]]
+    mids = rng.choice(middle, size=n)
+    names = np.char.add(np.char.add(base, " "), np.char.add(mids, "."))
+    if n > len(combos):  # last resort: cycle number keeps later cycles unique
+        cycle = idx // len(combos)
+        names = np.where(cycle > 0, np.char.add(names, cycle.astype(str)), names)
+    return names.tolist()
+
+def add_analytic_columns(conn):
+    """
+    Add any ANALYTIC_DERIVED_COLUMNS missing from analytic_student_term,
+    plus the (year, program) index the trends queries filter on.
+    """
+    have = {r[1] for r in conn.execute("PRAGMA table_xinfo(analytic_student_term);")}
+    for col, ddl in ANALYTIC_DERIVED_COLUMNS.items():
+        if col not in have:
+            conn.execute(f"ALTER TABLE analytic_student_term ADD COLUMN {col} {ddl};")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analytic_student_term_year_program "
+                 "ON analytic_student_term(year, program);")
+
+def create_indexes(conn, name, idx_cols=None):
+    for col in idx_cols or []:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{col} ON {name}({col});")
 
 def write_sqlite(conn, name, df, idx_cols=None):
     df.to_sql(name, conn, if_exists="replace", index=False)
-    if idx_cols:
-        for col in idx_cols:
-            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{col} ON {name}({col});")
+    create_indexes(conn, name, idx_cols)
+
+def df_rows(df: pd.DataFrame):
+    """Row tuples of native Python scalars (sqlite3 can't bind NumPy scalars)."""
+    return zip(*(df[c].tolist() for c in df.columns))
+
+def create_table(conn, name, schema: dict):
+    """Recreate `name` with the given {column: SQL type} schema."""
+    conn.execute(f"DROP TABLE IF EXISTS {name};")
+    conn.execute(f"CREATE TABLE {name} ({', '.join(f'{c} {t}' for c, t in schema.items())});")
+
+def insert_rows(conn, name, rows):
+    """
+    Bulk-insert `rows` (any iterable of tuples) into `name` with executemany.
+    Runs inside the caller's transaction (no commit here).
+    """
+    n_cols = len(conn.execute(f"SELECT * FROM {name} LIMIT 0").description)
+    conn.executemany(f"INSERT INTO {name} VALUES ({', '.join('?' * n_cols)});", rows)
 
 # ------------- Builders --------------
 def make_students(n_students: int, years: tuple[int,int], rng: np.random.Generator):
@@ -114,87 +170,147 @@ def make_students(n_students: int, years: tuple[int,int], rng: np.random.Generat
     latest_intake = max(y0, y1 - max_dur)  # e.g., 2025 - 6 = 2019 for Medicine
 
     programs = rng.choice(["Medicine","Nursing","Pharmacy"], size=n_students, p=[0.45,0.35,0.20])
+    programs = pd.Categorical(programs, categories=list(durations))
     intake_years = rng.integers(earliest_intake, latest_intake + 1, size=n_students)
     intakes_mnth = rng.choice(["Sep","Jan"], size=n_students, p=[0.7,0.3])
-    intake_str = [f"{y}-Sep" if m=="Sep" else f"{y}-Jan" for y,m in zip(intake_years, intakes_mnth)]
+    sep = intakes_mnth == "Sep"
+    intake_str = np.char.add(intake_years.astype("U4"), np.where(sep, "-Sep", "-Jan"))
 
     names = unique_names(n_students, rng)
     ages = rng.integers(18, 45, size=n_students)
     genders = rng.choice(["F","M"], size=n_students, p=[0.55,0.45])
 
-    # enrol_date aligned to academic year
-    enrol_dates = [pd.Timestamp(y, 9, 1) if m=="Sep" else pd.Timestamp(y, 1, 15)
-               for y,m in zip(intake_years, intakes_mnth)]
+    # enrol_date aligned to academic year: 1 Sep or 15 Jan of the intake year
+    months = (intake_years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + np.where(sep, 8, 0)
+    enrol_dates = months.astype("datetime64[D]") + np.where(sep, 0, 14)
+
+    # Per-student builder factors, computed once and broadcast by the builders
+    program_bonus = np.where(programs == "Medicine", 0.03, 0.0)  # attendance
+    lms_mult = np.select([programs == "Medicine", programs == "Nursing"], [1.1, 0.95], default=1.0)
 
     return pd.DataFrame({
         "student_id": np.arange(1, n_students+1),
         "full_name": names,
         "program": programs,
         "intake": intake_str,
-        "age": ages,
+        "age": ages.astype(np.int8),
         "gender": genders,
-        "enrol_date": enrol_dates
+        "enrol_date": enrol_dates,
+        "program_bonus": program_bonus,
+        "lms_mult": lms_mult,
     })
 
 def make_attendance(students: pd.DataFrame, rng: np.random.Generator):
-    rows = []
-    for _, r in students.iterrows():
-        terms = all_terms_for_program(r["intake"], r["program"], PROGRAM_DURATION)
-        for term in terms:
-            base = float(np.clip(rng.beta(8,2) + (0.03 if r["program"]=="Medicine" else 0.0), 0.05, 0.99))
-            for week in range(1, 13):  # 12 teaching weeks
-                sessions = 5
-                attended = int(rng.binomial(sessions, base))
-                rows.append([r["student_id"], term, week, sessions, attended])
-    return pd.DataFrame(rows, columns=["student_id","term","week","sessions","attended"])
+    # One row per (student, term); weeks are expanded with repeat/tile below
+    row, term, _ = student_terms(students)
+    sid = students["student_id"].to_numpy()[row]
+    bonus = students["program_bonus"].to_numpy()[row]
+
+    n, weeks, sessions = len(sid), 12, 5  # 12 teaching weeks, 5 sessions each
+    base = np.clip(rng.beta(8, 2, size=n) + bonus, 0.05, 0.99)
+    term = pd.Categorical(term)  # few distinct terms: int8 codes instead of a str per row
+    return pd.DataFrame({
+        "student_id": np.repeat(sid, weeks),
+        "term": pd.Categorical.from_codes(np.repeat(term.codes, weeks), term.categories),
+        "week": np.tile(np.arange(1, weeks + 1, dtype=np.int8), n),
+        "sessions": np.int8(sessions),
+        "attended": rng.binomial(sessions, np.repeat(base, weeks)).astype(np.int8),
+    })
 
 def make_lms_activity(students: pd.DataFrame, rng: np.random.Generator):
-    rows = []
-    for _, r in students.iterrows():
-        terms = all_terms_for_program(r["intake"], r["program"], PROGRAM_DURATION)
-        for term in terms:
-            d0, d1 = term_dates(term)
-            days = (d1 - d0).days + 1
-            base = max(0.8, rng.normal(3, 1))
-            mult = 1.1 if r["program"]=="Medicine" else (0.95 if r["program"]=="Nursing" else 1.0)
-            for i in range(days):
-                dt = d0 + timedelta(days=i)
-                clicks = max(0, int(rng.poisson(lam=base*mult)))
-                rows.append([r["student_id"], dt.isoformat(), clicks])
-    return pd.DataFrame(rows, columns=["student_id","activity_date","clicks"])
+    # One entry per (student, term); days are expanded with np.repeat below
+    row, term, _ = student_terms(students)
+    sid = students["student_id"].to_numpy()[row]
+    mult = students["lms_mult"].to_numpy()[row]
+    bounds = term_bounds(term)
+    codes = pd.Categorical(term, categories=bounds["term"]).codes
+    d0 = bounds["lo"].to_numpy(dtype="datetime64[D]")[codes]
+    days = ((bounds["hi"] - bounds["lo"]).dt.days + 1).to_numpy()[codes]
+
+    lam = np.maximum(0.8, rng.normal(3, 1, size=len(days))) * mult
+    # Day offset of each row within its term: global position minus the term's first row
+    offsets = np.arange(days.sum()) - np.repeat(np.cumsum(days) - days, days)
+    dates = np.repeat(d0, days) + offsets
+    return pd.DataFrame({
+        "student_id": np.repeat(sid, days),
+        "activity_date": dates.astype("datetime64[s]").astype(str),  # 'YYYY-MM-DDT00:00:00'
+        "clicks": rng.poisson(np.repeat(lam, days)).astype(np.int16),
+    })
 
 def make_assessments(students: pd.DataFrame, rng: np.random.Generator):
-    rows = []
-    for _, r in students.iterrows():
-        terms = all_terms_for_program(r["intake"], r["program"], PROGRAM_DURATION)
-        for term in terms:
-            midterm = float(np.clip(rng.normal(62, 15), 0, 100))
-            final = float(np.clip(rng.normal(68, 14), 0, 100))
-            late_submissions = int(rng.binomial(5, 0.12))
-            rows.append([r["student_id"], term, midterm, final, late_submissions])
-    return pd.DataFrame(rows, columns=["student_id","term","midterm","final","late_submissions"])
+    row, term, _ = student_terms(students)
+    n = len(row)
+    return pd.DataFrame({
+        "student_id": students["student_id"].to_numpy()[row],
+        "term": term,
+        "midterm": np.clip(rng.normal(62, 15, size=n), 0, 100),
+        "final": np.clip(rng.normal(68, 14, size=n), 0, 100),
+        "late_submissions": rng.binomial(5, 0.12, size=n).astype(np.int8),
+    })
 
 def make_events(students: pd.DataFrame, rng: np.random.Generator):
-    rows = []
-    for _, r in students.iterrows():
-        enrol = pd.to_datetime(r["enrol_date"])
-        terms = all_terms_for_program(r["intake"], r["program"], PROGRAM_DURATION)
-        rows.append([r["student_id"], "Enrolled", enrol, None, terms[0]])
-        # probation in an early term
-        if rng.random() < 0.18:
-            tprob = terms[min(1, len(terms)-1)]
-            rows.append([r["student_id"], "On Probation", enrol + timedelta(days=75), "Low attendance", tprob])
-            if rng.random() < 0.6:
-                rows.append([r["student_id"], "Intervention", enrol + timedelta(days=85), "Advisor meeting", tprob])
+    n = len(students)
+    sid = students["student_id"].to_numpy()
+    enrol = pd.to_datetime(students["enrol_date"]).to_numpy()
+    _, terms, n_terms = student_terms(students)
+    last = np.cumsum(n_terms) - 1
+    first = last - n_terms + 1
+    first_term = terms[first]
+    prob_term = terms[np.minimum(first + 1, last)]  # probation in an early term
+    final_term = terms[last]  # always a Spring term per builder
+    end_spring = pd.Series(final_term).map(term_bounds(final_term).set_index("term")["hi"]).to_numpy()
+
+    probation = rng.random(n) < 0.18
+    intervention = probation & (rng.random(n) < 0.6)
+    outcome = rng.choice(["Graduated","Withdrew","Deferred"], size=n, p=[0.85, 0.10, 0.05])
+
+    p, i = probation, intervention
+    df = pd.concat([
+        pd.DataFrame({"student_id": sid, "event_type": "Enrolled", "event_date": enrol,
+                      "details": None, "term": first_term}),
+        pd.DataFrame({"student_id": sid[p], "event_type": "On Probation", "event_date": enrol[p] + np.timedelta64(75, "D"),
+                      "details": "Low attendance", "term": prob_term[p]}),
+        pd.DataFrame({"student_id": sid[i], "event_type": "Intervention", "event_date": enrol[i] + np.timedelta64(85, "D"),
+                      "details": "Advisor meeting", "term": prob_term[i]}),
         # outcome at last spring
-        final_term = terms[-1]  # always a Spring term per builder
-        end_spring = term_dates(final_term)[1]
-        outcome = rng.choice(["Graduated","Withdrew","Deferred"], p=[0.85, 0.10, 0.05])
-        rows.append([r["student_id"], outcome, end_spring, None, final_term])
-    df = pd.DataFrame(rows, columns=["student_id","event_type","event_date","details","term"])
+        pd.DataFrame({"student_id": sid, "event_type": outcome, "event_date": end_spring,
+                      "details": None, "term": final_term}),
+    ], ignore_index=True)
+    # Stable sort keeps each student's events in Enrolled → … → outcome order
+    df = df.sort_values("student_id", kind="stable", ignore_index=True)
     df["event_date"] = pd.to_datetime(df["event_date"])
     return df
 
+def build_chunk(students: pd.DataFrame, seed: np.random.SeedSequence):
+    """Run every builder over one chunk of students, each with its own child seed."""
+    builders = [make_attendance, make_lms_activity, make_assessments, make_events]
+    rngs = [np.random.default_rng(s) for s in seed.spawn(len(builders))]
+    return [fn(students, r) for fn, r in zip(builders, rngs)]
+
+def run_builders(students: pd.DataFrame, seed: int, workers: int = 4, chunk_size: int = 1000):
+    """
+    Yield (attendance, lms_activity, assessments, student_events) per chunk
+    of `chunk_size` students, in student order. Chunks are built in parallel
+    with at most `workers` results in flight, so peak memory stays bounded
+    by the chunk size rather than --students. Each chunk gets its own child
+    of SeedSequence(seed), keeping output deterministic regardless of worker
+    count.
+    """
+    chunks = [students.iloc[i:i + chunk_size] for i in range(0, len(students), chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    if workers <= 1:
+        for chunk, ss in zip(chunks, seeds):
+            yield build_chunk(chunk, ss)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for chunk, ss in zip(chunks, seeds):
+            pending.append(ex.submit(build_chunk, chunk, ss))
+            if len(pending) > workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
 # ------------- Main --------------
 def main():
     args = parse_args()
@@ -205,50 +321,107 @@ def main():
     print(f"[INFO] Window: {args.year_start}..{args.year_end}  Students: {args.students}  Seed: {args.seed}")
 
     students = make_students(args.students, (args.year_start, args.year_end), rng)
-    attendance = make_attendance(students, rng)
-    lms = make_lms_activity(students, rng)
-    assessments = make_assessments(students, rng)
-    events = make_events(students, rng)
 
     con = sqlite3.connect(args.db)
     try:
+        # Full rebuild: no rollback journal or fsync needed while loading
+        con.executescript("""
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+        """)
+        # Base tables: generated chunk by chunk and streamed in with
+        # executemany, all in one transaction
         print("[INFO] Writing base tables…")
-        write_sqlite(con, "students", students, ["student_id","program","intake","full_name"])
-        write_sqlite(con, "attendance", attendance, ["student_id","term","week"])
-        write_sqlite(con, "lms_activity", lms, ["student_id","activity_date"])
-        write_sqlite(con, "assessments", assessments, ["student_id","term"])
-        write_sqlite(con, "student_events", events, ["student_id","event_date","event_type"])
+        con.execute("BEGIN")
+        for name, (schema, _) in BASE_TABLES.items():
+            create_table(con, name, schema)
+        for attendance, lms, assessments, events in run_builders(
+                students, args.seed, args.workers, args.chunk_size):
+            insert_rows(con, "attendance", df_rows(attendance))
+            insert_rows(con, "lms_activity", df_rows(lms))
+            insert_rows(con, "assessments", df_rows(assessments))
+            insert_rows(con, "student_events", df_rows(events.assign(
+                event_date=events["event_date"].dt.strftime("%Y-%m-%d %H:%M:%S"))))
 
         # -------- Rollups --------
+        # Built entirely in SQL: the term rollups aggregate straight from the
+        # base tables (before their indexes exist, so both are sequential
+        # scans) and feed the analytic table's INSERT … SELECT below; nothing
+        # is read back into pandas
         print("[INFO] Building rollups…")
-        att_term = (attendance.groupby(["student_id","term"], as_index=False)
-                    .agg(total_sessions=("sessions","sum"),
-                         attended=("attended","sum")))
-        write_sqlite(con, "attendance_term", att_term, ["student_id","term"])
-
-        lms["activity_date"] = pd.to_datetime(lms["activity_date"])
-        pieces = []
-        for term in pd.unique(att_term["term"]):
-            lo, hi = term_dates(term)
-            m = lms["activity_date"].between(lo, hi)
-            g = (lms.loc[m].groupby("student_id", as_index=False)
-                 .agg(clicks=("clicks","sum")))
-            g["term"] = term
-            pieces.append(g)
-        lms_term = pd.concat(pieces, ignore_index=True)[["student_id","term","clicks"]]
-        write_sqlite(con, "lms_term", lms_term, ["student_id","term"])
-
-        df = (students
-              .merge(att_term, on=["student_id"])
-              .merge(lms_term, on=["student_id","term"])
-              .merge(assessments, on=["student_id","term"]))
-        df["attendance_rate"] = df["attended"] / df["total_sessions"]
-        df["activity_decile"] = pd.qcut(df["clicks"].rank(method="first"), 10, labels=False) + 1
-        df["on_time_rate"] = 1 - (df["late_submissions"] / 5)
-        df["at_risk"] = ((df["attendance_rate"] < 0.80) | (df["activity_decile"] <= 2)) & (df["midterm"] < 50)
-
-        write_sqlite(con, "analytic_student_term", df,
-                     ["student_id","term","program","intake"])
+        create_table(con, "attendance_term", {"student_id": "INTEGER", "term": "TEXT",
+                                              "total_sessions": "INTEGER", "attended": "INTEGER"})
+        con.execute("""
+            INSERT INTO attendance_term
+            SELECT student_id, term, SUM(sessions), SUM(attended)
+            FROM attendance GROUP BY student_id, term
+        """)
+        # Each LMS day's term follows from its date (Fall = Sep–Dec,
+        # Spring = Jan–Jun); Jul/Aug days belong to no term and drop out
+        create_table(con, "lms_term", {"student_id": "INTEGER", "term": "TEXT", "clicks": "INTEGER"})
+        con.execute("""
+            INSERT INTO lms_term
+            SELECT student_id,
+                   substr(activity_date, 1, 4) ||
+                   CASE WHEN substr(activity_date, 6, 2) >= '09' THEN '-Fall' ELSE '-Spring' END AS term,
+                   SUM(clicks)
+            FROM lms_activity
+            WHERE substr(activity_date, 6, 2) NOT IN ('07', '08')
+            GROUP BY student_id, term
+        """)
+        for name, (_, idx_cols) in BASE_TABLES.items():
+            create_indexes(con, name, idx_cols)
+        create_indexes(con, "attendance_term", ["student_id","term"])
+        create_indexes(con, "lms_term", ["student_id","term"])
+        con.commit()
+
+        students = students.drop(columns=["program_bonus","lms_mult"])  # builder-only inputs
+        write_sqlite(con, "students", students, ["student_id","program","intake","full_name"])
+        # Full-text index for the app's name search (external content over students)
+        con.executescript("""
+            DROP TABLE IF EXISTS students_fts;
+            CREATE VIRTUAL TABLE students_fts USING fts5(
+                full_name, content='students', content_rowid='student_id'
+            );
+            INSERT INTO students_fts(students_fts) VALUES('rebuild');
+        """)
+
+        # Analytic table: one join of students and the three per-(student,
+        # term) tables, with every derived column computed inline in SQL
+        create_table(con, "analytic_student_term", {
+            "student_id": "INTEGER", "full_name": "TEXT", "program": "TEXT", "intake": "TEXT",
+            "age": "INTEGER", "gender": "TEXT", "enrol_date": "TIMESTAMP", "term": "TEXT",
+            "total_sessions": "INTEGER", "attended": "INTEGER", "clicks": "INTEGER",
+            "midterm": "REAL", "final": "REAL", "late_submissions": "INTEGER",
+            "attendance_rate": "REAL", "activity_decile": "INTEGER", "on_time_rate": "REAL",
+            "at_risk": "INTEGER",
+        })
+        con.execute("""
+            INSERT INTO analytic_student_term
+            WITH t AS (
+                SELECT s.student_id, s.full_name, s.program, s.intake, s.age, s.gender, s.enrol_date,
+                       a.term, a.total_sessions, a.attended, l.clicks,
+                       x.midterm, x.final, x.late_submissions,
+                       a.attended * 1.0 / a.total_sessions AS attendance_rate,
+                       -- Equal-size click deciles; ties broken by (student, term) so rebuilds match
+                       NTILE(10) OVER (ORDER BY l.clicks, a.student_id, a.term) AS activity_decile,
+                       1 - x.late_submissions / 5.0 AS on_time_rate
+                FROM students s
+                JOIN attendance_term a ON a.student_id = s.student_id
+                JOIN lms_term l ON l.student_id = a.student_id AND l.term = a.term
+                JOIN assessments x ON x.student_id = a.student_id AND x.term = a.term
+            )
+            SELECT *,
+                   (attendance_rate < 0.80 OR activity_decile <= 2) AND midterm < 50
+            FROM t ORDER BY student_id, term
+        """)
+        add_analytic_columns(con)
+        create_indexes(con, "analytic_student_term", ["student_id","term","program","intake"])
+        con.commit()
+        # Back to the app's runtime settings
+        con.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
 
         # Sanity prints
         print(f"[INFO] Database created: {args.db}")